@@ -1,64 +1,146 @@
 #!/usr/bin/env python3
-# Minimaler Ollama-Mock (Stdlib):
+# Minimaler Ollama-Mock (Starlette/uvicorn, sonst Stdlib; orjson optional):
 #  GET  /api/tags  -> {"models":[{"name":"llama3:8b"}]}
 #  POST /api/chat  -> {"message":{"content":"(mock) <echo>" }}
+#  POST /api/embed -> {"embeddings":[[...128 floats...]], "model":"<model>"}
 import json
 import sys
 from http.server import BaseHTTPRequestHandler, HTTPServer
 
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+
+except ImportError:  # pragma: no cover - orjson ist optional
+    orjson = None
+
+    def _loads(raw: bytes):
+        return json.loads(raw.decode("utf-8"))
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy ist optional
+    np = None
+
+try:
+    import uvicorn
+    from starlette.applications import Starlette
+    from starlette.responses import Response
+    from starlette.routing import Route
+except ImportError:  # pragma: no cover - ASGI-Stack ist optional
+    uvicorn = None
+
 HOST = "127.0.0.1"
 PORT = 11434
 
+# Statische Antworten einmalig vorserialisiert
+_TAGS = b'{"models":[{"name":"llama3:8b"}]}'
+_NOT_FOUND = b'{"error":"not found"}'
+
+
+def _parse(raw: bytes) -> dict:
+    try:
+        payload = _loads(raw) if raw else {}
+    except Exception:
+        payload = {}
+    return payload
+
+
+def _chat(payload: dict) -> dict:
+    content = "(mock) ok"
+    for m in (payload.get("messages") or [])[::-1]:
+        if m.get("role") == "user":
+            content = "(mock) " + str(m.get("content", ""))
+            break
+    return {"message": {"content": content}}
+
+
+def _embed(payload: dict) -> dict:
+    inputs = payload.get("input") or []
+    if isinstance(inputs, str):
+        inputs = [inputs]
+    # Dummy-Vektoren (Größe 128)
+    if np is not None and orjson is not None:
+        # Ein Vektor-Fill statt N*128 Python-Floats; orjson serialisiert das ndarray direkt
+        vals = (0.1 * (np.arange(len(inputs)) % 10)).astype(np.float32)
+        embeddings = np.repeat(vals[:, None], 128, axis=1)
+    else:
+        embeddings = [[0.1 * (i % 10)] * 128 for i in range(len(inputs))]
+    return {"embeddings": embeddings, "model": payload.get("model", "mock")}
+
 
 class Handler(BaseHTTPRequestHandler):
     def _send(self, code: int, body: dict):
-        data = json.dumps(body).encode("utf-8")
+        self._send_raw(code, _dumps(body))
+
+    def _send_raw(self, code: int, data: bytes):
         self.send_response(code)
         self.send_header("Content-Type", "application/json")
         self.send_header("Content-Length", str(len(data)))
         self.end_headers()
         self.wfile.write(data)
 
+    def _read_payload(self) -> dict:
+        length = int(self.headers.get("Content-Length", "0"))
+        raw = self.rfile.read(length) if length > 0 else b"{}"
+        return _parse(raw)
+
     def do_GET(self):
         if self.path.startswith("/api/tags"):
-            self._send(200, {"models": [{"name": "llama3:8b"}]})
+            self._send_raw(200, _TAGS)
         else:
-            self._send(404, {"error": "not found"})
+            self._send_raw(404, _NOT_FOUND)
 
     def do_POST(self):
         if self.path.startswith("/api/chat"):
-            length = int(self.headers.get("Content-Length", "0"))
-            raw = self.rfile.read(length) if length > 0 else b"{}"
-            try:
-                payload = json.loads(raw.decode("utf-8"))
-            except Exception:
-                payload = {}
-            content = "(mock) ok"
-            for m in (payload.get("messages") or [])[::-1]:
-                if m.get("role") == "user":
-                    content = "(mock) " + str(m.get("content", ""))
-                    break
-            self._send(200, {"message": {"content": content}})
+            self._send(200, _chat(self._read_payload()))
         elif self.path.startswith("/api/embed"):
-            length = int(self.headers.get("Content-Length", "0"))
-            raw = self.rfile.read(length) if length > 0 else b"{}"
-            try:
-                payload = json.loads(raw.decode("utf-8"))
-            except Exception:
-                payload = {}
-            inputs = payload.get("input") or []
-            if isinstance(inputs, str):
-                inputs = [inputs]
-            # Dummy-Vektoren (Größe 128)
-            embeddings = [[0.1 * (i % 10)] * 128 for i in range(len(inputs))]
-            self._send(200, {"embeddings": embeddings, "model": payload.get("model", "mock")})
+            self._send(200, _embed(self._read_payload()))
         else:
-            self._send(404, {"error": "not found"})
+            self._send_raw(404, _NOT_FOUND)
+
+
+if uvicorn is not None:
+
+    def _json(data: bytes, status_code: int = 200) -> Response:
+        return Response(data, status_code=status_code, media_type="application/json")
+
+    async def handle(request):
+        # Präfix-Matching wie im Stdlib-Handler, damit beide Server gleich antworten
+        path = request.url.path
+        if request.method == "GET":
+            if path.startswith("/api/tags"):
+                return _json(_TAGS)
+        elif path.startswith("/api/chat"):
+            return _json(_dumps(_chat(_parse(await request.body()))))
+        elif path.startswith("/api/embed"):
+            return _json(_dumps(_embed(_parse(await request.body()))))
+        return _json(_NOT_FOUND, status_code=404)
+
+    async def not_found(request, exc):
+        return _json(_NOT_FOUND, status_code=404)
+
+    app = Starlette(
+        routes=[Route("/{path:path}", handle, methods=["GET", "POST"])],
+        exception_handlers={404: not_found, 405: not_found},
+    )
 
 
 def main():
     print(f"mock-ollama listening on http://{HOST}:{PORT}", file=sys.stderr)
-    HTTPServer((HOST, PORT), Handler).serve_forever()
+    if uvicorn is not None:
+        # "auto" wählt uvloop/httptools, sofern installiert (uvicorn[standard])
+        uvicorn.run(app, host=HOST, port=PORT, loop="auto", http="auto", log_level="warning")
+    else:
+        HTTPServer((HOST, PORT), Handler).serve_forever()
 
 
 if __name__ == "__main__":
@@ -4,7 +4,9 @@
 from __future__ import annotations
 
 import json
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 try:
@@ -12,6 +14,26 @@ try:
 except ImportError as exc:  # pragma: no cover - missing optional dependency
     raise SystemExit("jsonschema is required. Install via `uv sync --extra dev`.") from exc
 
+try:
+    from orjson import loads as _loads
+except ImportError:  # pragma: no cover - orjson is optional
+    _loads = json.loads
+
+# Built once and shared by all workers; check_schema() would rebuild it per file.
+_META_VALIDATOR = Draft202012Validator(
+    Draft202012Validator.META_SCHEMA,
+    format_checker=Draft202012Validator.FORMAT_CHECKER,
+)
+
+
+def _validate_one(schema_path: Path) -> tuple[Path, Exception | None]:
+    try:
+        schema = _loads(schema_path.read_bytes())
+        _META_VALIDATOR.validate(schema)
+    except Exception as exc:
+        return schema_path, exc
+    return schema_path, None
+
 
 def main() -> int:
     repo_root = Path(__file__).resolve().parent.parent
@@ -21,15 +43,16 @@ def main() -> int:
         print("No JSON Schemas found under docs/contracts - skipping.")
         return 0
 
+    max_workers = min(32, (os.cpu_count() or 4) * 4, len(schema_paths))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # map() preserves input order, so output stays sorted by path.
+        results = list(executor.map(_validate_one, schema_paths))
+
     exit_code = 0
-    for schema_path in schema_paths:
+    for schema_path, error in results:
         rel = schema_path.relative_to(repo_root)
-        try:
-            with schema_path.open("r", encoding="utf-8") as handle:
-                schema = json.load(handle)
-            Draft202012Validator.check_schema(schema)
-        except Exception as exc:
-            print(f"✗ {rel}: {exc}")
+        if error is not None:
+            print(f"✗ {rel}: {error}")
             exit_code = 1
         else:
             print(f"✓ {rel}")
@@ -3,20 +3,45 @@
 from __future__ import annotations
 
 import json
+import logging
 import os
 import platform
+import queue
 import secrets
+import threading
+import time
 import uuid
-from datetime import datetime, timezone
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 from fastapi import Depends, FastAPI, Header, HTTPException, status
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, ConfigDict, Field
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
 APP_VERSION = os.getenv("HAUSKI_VERSION", "0.1.0")
 TOKEN_ENV = "HAUSKI_TOKEN"
 EVENT_BASE_ENV = "HAUSKI_DATA"
+EVENT_BATCH_MAX = 256
+
+# Resolved once; these do not change while the process runs.
+_NODE_ID = os.getenv("HAUSKI_NODE_ID") or platform.node() or "unknown"
+_EVENT_ID_OVERRIDE = os.getenv("HAUSKI_EVENT_ID")
+
+logger = logging.getLogger(__name__)
+
+# Pending (file, encoded line) pairs for the background writer; None stops it.
+_event_queue: queue.Queue[tuple[Path, bytes] | None] = queue.Queue()
+_event_writer: threading.Thread | None = None
+# (month, HAUSKI_DATA, file) of the last resolved event file.
+_event_file_cache: tuple[str, str | None, Path] | None = None
 
 
 def _event_dir() -> Path:
@@ -27,24 +52,121 @@ def _event_dir() -> Path:
     return events_dir
 
 
+def _event_file() -> Path:
+    """Return the current month's event file, resolving the directory once per month."""
+    global _event_file_cache
+    month = time.strftime("%Y-%m", time.localtime())
+    base_env = os.getenv(EVENT_BASE_ENV)
+    cached = _event_file_cache
+    if cached is not None and cached[0] == month and cached[1] == base_env:
+        return cached[2]
+    filename = _event_dir() / f"{month}.jsonl"
+    _event_file_cache = (month, base_env, filename)
+    return filename
+
+
 def append_event(kind: str, payload: dict[str, Any]) -> None:
     """Append an event line using the shared HausKI schema."""
-    events_dir = _event_dir()
-    now = datetime.now(timezone.utc)
-    filename = events_dir / f"{now.astimezone().strftime('%Y-%m')}.jsonl"
-
-    node_id = os.getenv("HAUSKI_NODE_ID") or platform.node() or "unknown"
+    filename = _event_file()
     event_line = {
-        "id": os.getenv("HAUSKI_EVENT_ID", str(uuid.uuid4())),
-        "node_id": node_id,
-        "ts": int(now.timestamp() * 1000),
+        "id": _EVENT_ID_OVERRIDE if _EVENT_ID_OVERRIDE is not None else str(uuid.uuid4()),
+        "node_id": _NODE_ID,
+        "ts": time.time_ns() // 1_000_000,
         "kind": kind,
         "payload": payload,
     }
 
-    with filename.open("a", encoding="utf-8") as handle:
-        handle.write(json.dumps(event_line, ensure_ascii=False))
-        handle.write("\n")
+    # Encoded here so serialization errors surface to the caller, not the writer.
+    line = _encode_event(event_line)
+    if _event_writer is not None and _event_writer.is_alive():
+        _event_queue.put_nowait((filename, line))
+        return
+
+    # No writer running (e.g. outside the app lifespan): write synchronously.
+    with filename.open("ab") as handle:
+        handle.write(line)
+
+
+def _encode_event(event_line: dict[str, Any]) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(event_line) + b"\n"
+        except TypeError:
+            # e.g. ints beyond 64 bit, which the stdlib encoder still handles
+            pass
+    return (json.dumps(event_line, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _event_writer_loop() -> None:
+    """Drain queued events in batches, keeping the current month's file open."""
+    current: Path | None = None
+    handle = None
+    try:
+        while True:
+            batch = [_event_queue.get()]
+            while len(batch) < EVENT_BATCH_MAX:
+                try:
+                    batch.append(_event_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            for item in batch:
+                if item is None:
+                    return
+                filename, line = item
+                try:
+                    if filename != current:
+                        if handle is not None:
+                            handle.close()
+                        handle = filename.open("ab")
+                        current = filename
+                    handle.write(line)
+                except Exception:
+                    logger.exception("failed to write event to %s", filename)
+                    current = None
+            if handle is not None:
+                try:
+                    handle.flush()
+                except Exception:
+                    logger.exception("failed to flush events to %s", current)
+                    current = None
+    finally:
+        if handle is not None:
+            handle.close()
+
+
+def _start_event_writer() -> None:
+    global _event_writer
+    if _event_writer is None or not _event_writer.is_alive():
+        _event_writer = threading.Thread(
+            target=_event_writer_loop, name="hauski-event-writer", daemon=True
+        )
+        _event_writer.start()
+
+
+def _stop_event_writer() -> None:
+    global _event_writer
+    if _event_writer is not None:
+        _event_queue.put(None)
+        _event_writer.join()
+        _event_writer = None
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson when available.
+
+    Handlers return instances directly, which skips FastAPI's
+    ``jsonable_encoder`` pass and response-model validation.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            try:
+                return orjson.dumps(content)
+            except TypeError:
+                # e.g. ints beyond 64 bit, which the stdlib encoder still handles
+                pass
+        return super().render(content)
 
 
 class MetricsIngest(BaseModel):
@@ -80,7 +202,21 @@ class PolicyFeedback(BaseModel):
     metadata: dict[str, Any] = Field(default_factory=dict)
 
 
-app = FastAPI(title="HausKI Shadow Policy API", version=APP_VERSION)
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    _start_event_writer()
+    try:
+        yield
+    finally:
+        _stop_event_writer()
+
+
+app = FastAPI(
+    title="HausKI Shadow Policy API",
+    version=APP_VERSION,
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
+)
 
 _latest_metrics: dict[str, Any] = {}
 
@@ -98,19 +234,19 @@ def require_token(x_auth: str | None = Header(default=None)) -> None:
 
 
 @app.post("/v1/ingest/metrics", dependencies=[Depends(require_token)])
-def ingest_metrics(payload: MetricsIngest) -> dict[str, str]:
+def ingest_metrics(payload: MetricsIngest) -> FastJSONResponse:
     global _latest_metrics
     _latest_metrics = payload.model_dump()
     append_event("metrics.ingest", _latest_metrics)
-    return {"status": "ok"}
+    return FastJSONResponse({"status": "ok"})
 
 
 @app.post(
     "/v1/policy/decide",
     dependencies=[Depends(require_token)],
-    response_model=PolicyDecisionResponse,
+    responses={200: {"model": PolicyDecisionResponse}},
 )
-def policy_decide(request: PolicyDecisionRequest) -> PolicyDecisionResponse:
+def policy_decide(request: PolicyDecisionRequest) -> FastJSONResponse:
     now = datetime.now().astimezone()
     hour = now.hour
     if hour < 12:
@@ -123,26 +259,28 @@ def policy_decide(request: PolicyDecisionRequest) -> PolicyDecisionResponse:
         action = "remind.evening"
         why = "Evening shadow policy recommendation"
 
-    response = PolicyDecisionResponse(
-        action=action,
-        score=0.5,
-        why=why,
-        context={"requested": request.context, "observed_hour": hour},
-    )
+    # Built from trusted internal values; matches PolicyDecisionResponse without
+    # a validation pass or model_dump() copy.
+    decision = {
+        "action": action,
+        "score": 0.5,
+        "why": why,
+        "context": {"requested": request.context, "observed_hour": hour},
+    }
 
-    append_event("policy.shadow_decide", response.model_dump())
-    return response
+    append_event("policy.shadow_decide", decision)
+    return FastJSONResponse(decision)
 
 
 @app.post("/v1/policy/feedback", dependencies=[Depends(require_token)])
-def policy_feedback(feedback: PolicyFeedback) -> dict[str, str]:
+def policy_feedback(feedback: PolicyFeedback) -> FastJSONResponse:
     append_event("policy.feedback", feedback.model_dump())
-    return {"status": "queued"}
+    return FastJSONResponse({"status": "queued"})
 
 
 @app.get("/v1/health/latest", dependencies=[Depends(require_token)])
-def health_latest() -> dict[str, Any]:
-    return {"status": "ok", "metrics": _latest_metrics or None}
+def health_latest() -> FastJSONResponse:
+    return FastJSONResponse({"status": "ok", "metrics": _latest_metrics or None})
 
 
 @app.get("/version")
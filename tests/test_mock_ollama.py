@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT = ROOT / "scripts/mock_ollama.py"
+
+
+def _load_mock():
+    spec = importlib.util.spec_from_file_location("mock_ollama", SCRIPT)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_single_mock_ollama_copy() -> None:
+    copies = [
+        path
+        for base in ("scripts", "tools", "services", "tests")
+        for path in (ROOT / base).rglob("mock_ollama.py")
+    ]
+    assert copies == [SCRIPT]
+
+
+def test_static_bodies_match_ollama_shape() -> None:
+    module = _load_mock()
+    assert json.loads(module._TAGS) == {"models": [{"name": "llama3:8b"}]}
+    assert json.loads(module._NOT_FOUND) == {"error": "not found"}
+
+
+def test_chat_echoes_last_user_message() -> None:
+    module = _load_mock()
+    payload = module._parse(
+        b'{"messages":[{"role":"user","content":"a"},{"role":"assistant","content":"b"},'
+        b'{"role":"user","content":"c"}]}'
+    )
+    assert json.loads(module._dumps(module._chat(payload))) == {"message": {"content": "(mock) c"}}
+
+
+def test_embed_returns_one_vector_per_input() -> None:
+    module = _load_mock()
+    body = json.loads(module._dumps(module._embed({"input": ["x", "y", "z"], "model": "m"})))
+    assert body["model"] == "m"
+    assert [len(vec) for vec in body["embeddings"]] == [128, 128, 128]
+    assert body["embeddings"][1][0] == pytest.approx(0.1)
+
+
+def test_invalid_body_falls_back_to_empty_payload() -> None:
+    module = _load_mock()
+    assert module._parse(b"not json") == {}
+    assert module._parse(b"") == {}
+
+
+def test_asgi_app_matches_stdlib_routing() -> None:
+    pytest.importorskip("uvicorn")
+    pytest.importorskip("httpx")
+    from starlette.testclient import TestClient
+
+    module = _load_mock()
+    client = TestClient(module.app)
+
+    assert client.get("/api/tags").content == module._TAGS
+    assert client.get("/api/tags/extra").content == module._TAGS
+    for method, path in (("GET", "/api/chat"), ("POST", "/api/tags"), ("GET", "/nope")):
+        resp = client.request(method, path)
+        assert (resp.status_code, resp.content) == (404, module._NOT_FOUND)
+    chat = client.post("/api/chat/", content=b'{"messages":[{"role":"user","content":"x"}]}')
+    assert chat.json() == {"message": {"content": "(mock) x"}}
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT = ROOT / "services/policy_shadow/app.py"
+TOKEN = "test-token"
+
+
+@pytest.fixture
+def shadow(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("HAUSKI_DATA", str(tmp_path))
+    monkeypatch.setenv("HAUSKI_TOKEN", TOKEN)
+    spec = importlib.util.spec_from_file_location("policy_shadow_app", SCRIPT)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    # Registered so pydantic can resolve the app's postponed annotations.
+    monkeypatch.setitem(sys.modules, spec.name, module)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_decide_echoes_context_beyond_64_bit(shadow) -> None:
+    with TestClient(shadow.app) as client:
+        resp = client.post(
+            "/v1/policy/decide",
+            json={"context": {"big": 2**70}},
+            headers={"x-auth": TOKEN},
+        )
+
+    assert resp.status_code == 200
+    assert resp.json()["context"]["requested"] == {"big": 2**70}
+
+
+def _event_lines(base: Path) -> list[dict]:
+    path = base / "events" / f"{time.strftime('%Y-%m', time.localtime())}.jsonl"
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_lifespan_writer_flushes_events_on_shutdown(shadow, tmp_path: Path) -> None:
+    headers = {"x-auth": TOKEN}
+    with TestClient(shadow.app) as client:
+        assert shadow._event_writer is not None and shadow._event_writer.is_alive()
+        metrics = {"ts": 1, "host": "h", "updates": {}, "backup": {}, "drift": {}}
+        assert client.post("/v1/ingest/metrics", json=metrics, headers=headers).status_code == 200
+        assert client.post("/v1/policy/decide", json={}, headers=headers).status_code == 200
+        feedback = {"metadata": {"big": 2**70}}
+        assert client.post("/v1/policy/feedback", json=feedback, headers=headers).status_code == 200
+        assert client.post("/v1/policy/feedback", json={}, headers=headers).status_code == 200
+
+    assert shadow._event_writer is None
+    events = _event_lines(tmp_path)
+    assert [e["kind"] for e in events] == [
+        "metrics.ingest",
+        "policy.shadow_decide",
+        "policy.feedback",
+        "policy.feedback",
+    ]
+    assert events[2]["payload"]["metadata"] == {"big": 2**70}
+    assert all(e["node_id"] and isinstance(e["ts"], int) for e in events)
+
+
+def test_append_event_without_lifespan_writes_synchronously(shadow, tmp_path: Path) -> None:
+    assert shadow._event_writer is None
+
+    shadow.append_event("test.sync", {"n": 1})
+
+    events = _event_lines(tmp_path)
+    assert [(e["kind"], e["payload"]) for e in events] == [("test.sync", {"n": 1})]
+
+
+def test_event_file_follows_month_and_data_dir(shadow, tmp_path: Path, monkeypatch) -> None:
+    month = {"value": "2030-01"}
+    monkeypatch.setattr(shadow.time, "strftime", lambda fmt, t=None: month["value"])
+
+    shadow.append_event("test.a", {})
+    month["value"] = "2030-02"
+    shadow.append_event("test.b", {})
+    other = tmp_path / "other"
+    monkeypatch.setenv("HAUSKI_DATA", str(other))
+    shadow.append_event("test.c", {})
+
+    def kinds(path: Path) -> list[str]:
+        return [json.loads(line)["kind"] for line in path.read_text(encoding="utf-8").splitlines()]
+
+    assert kinds(tmp_path / "events" / "2030-01.jsonl") == ["test.a"]
+    assert kinds(tmp_path / "events" / "2030-02.jsonl") == ["test.b"]
+    assert kinds(other / "events" / "2030-02.jsonl") == ["test.c"]
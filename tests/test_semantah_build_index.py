@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import importlib.util
+import threading
+import time
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT = ROOT / "tools/semantah/build_index.py"
+MOCK = ROOT / "scripts/mock_ollama.py"
+
+
+def _load(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _load_build_index():
+    return _load("build_index", SCRIPT)
+
+
+@pytest.fixture
+def ollama(monkeypatch):
+    """Serve mock_ollama's Handler on an ephemeral port with HTTP/1.1 keep-alive."""
+    mock = _load("mock_ollama", MOCK)
+    # Encode each input into its vector so the test can check ordering.
+    monkeypatch.setattr(
+        mock, "_embed", lambda payload: {"embeddings": [[float(t)] for t in payload["input"]]}
+    )
+
+    class KeepAliveHandler(mock.Handler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    try:
+        yield mock, f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _write_chunks(base: Path, count: int) -> list[Path]:
+    base.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(count):
+        path = base / f"note{i:02d}.md"
+        path.write_text(f"Notiz {i}\n", encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+class _FixedEmbedder:
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        return [[float(i), 0.5, 1.0] for i in range(len(texts))]
+
+
+def test_parquet_with_empty_embeddings_reads_back(tmp_path: Path, capsys) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    module = _load_build_index()
+    gewebe = module.ensure_dirs(tmp_path / "index" / "default")
+    chunks = _write_chunks(tmp_path / "notes", 2)
+    # Unreachable Ollama + allow_empty yields one [] per chunk.
+    embedder = module.OllamaEmbedder("http://127.0.0.1:1", "m", allow_empty=True)
+
+    stats = module.write_embeddings(gewebe, chunks, embedder)
+
+    assert stats == {"passed": 2, "read": 2, "embedded": 2}
+    table = pq.read_table(gewebe / "embeddings.parquet")
+    assert table.column("embedding").to_pylist() == [[], []]
+    assert "WARNUNG" in capsys.readouterr().out
+
+
+def test_parquet_uses_fixed_size_float32_lists(tmp_path: Path) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    pa = pytest.importorskip("pyarrow")
+    module = _load_build_index()
+    gewebe = module.ensure_dirs(tmp_path / "index" / "default")
+    chunks = _write_chunks(tmp_path / "notes", 3)
+
+    module.write_embeddings(gewebe, chunks, _FixedEmbedder())
+
+    table = pq.read_table(gewebe / "embeddings.parquet")
+    assert table.schema.field("embedding").type == pa.list_(pa.float32(), 3)
+    assert table.column("embedding").to_pylist()[2] == [2.0, 0.5, 1.0]
+    assert table.column("namespace").to_pylist() == ["default"] * 3
+
+
+@pytest.mark.parametrize("max_inflight", [1, 4])
+def test_embed_batches_keep_input_order(ollama, max_inflight: int) -> None:
+    _, url = ollama
+    module = _load_build_index()
+    texts = [str(i) for i in range(25)]
+
+    with module.OllamaEmbedder(url, "m", batch_size=3, max_inflight=max_inflight) as embedder:
+        first = embedder.embed(texts)
+        second = embedder.embed(texts)
+        assert 0 < len(embedder._idle) <= max_inflight
+
+    assert first == second == [[float(i)] for i in range(25)]
+    assert embedder._idle == []
+
+
+def test_embed_count_mismatch_raises(ollama, monkeypatch) -> None:
+    mock, url = ollama
+    monkeypatch.setattr(mock, "_embed", lambda payload: {"embeddings": [[0.0]]})
+    module = _load_build_index()
+
+    with (
+        module.OllamaEmbedder(url, "m", batch_size=2) as embedder,
+        pytest.raises(RuntimeError, match=r"Anzahl Embeddings \(1\) entspricht nicht Input \(2\)"),
+    ):
+        embedder.embed(["a", "b", "c"])
+
+
+def test_embed_allow_empty_returns_empty_vectors(ollama, monkeypatch, capsys) -> None:
+    mock, url = ollama
+    monkeypatch.setattr(mock, "_embed", lambda payload: {"embeddings": []})
+    module = _load_build_index()
+
+    with module.OllamaEmbedder(url, "m", allow_empty=True, batch_size=2) as embedder:
+        assert embedder.embed(["a", "b", "c"]) == [[], [], []]
+
+    assert "--allow-empty-embeddings" in capsys.readouterr().out
+
+
+def test_embed_http_error_is_reported(ollama) -> None:
+    _, url = ollama
+    module = _load_build_index()
+
+    # The mock answers unknown paths with 404.
+    with (
+        module.OllamaEmbedder(f"{url}/prefix", "m") as embedder,
+        pytest.raises(RuntimeError, match="HTTP 404"),
+    ):
+        embedder.embed(["a"])
+
+
+def test_embed_recovers_when_server_drops_idle_connections(ollama, monkeypatch) -> None:
+    mock, url = ollama
+    # The mock closes keep-alive connections after 0.2 s without a request.
+    monkeypatch.setattr(mock.Handler, "timeout", 0.2)
+    module = _load_build_index()
+    texts = [str(i) for i in range(16)]
+
+    with module.OllamaEmbedder(url, "m", batch_size=2, max_inflight=4) as embedder:
+        assert embedder.embed(texts) == [[float(i)] for i in range(16)]
+        assert len(embedder._idle) == 4
+        time.sleep(0.5)  # every pooled socket is now closed on the server side
+
+        assert embedder.embed(texts) == [[float(i)] for i in range(16)]
+        assert 0 < len(embedder._idle) <= 4
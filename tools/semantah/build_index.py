@@ -5,57 +5,186 @@ from __future__ import annotations
 
 import argparse
 import contextlib
+import http.client
 import json
 import os
-import urllib.error
-import urllib.request
+import threading
+import urllib.parse
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ist optional
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - msgspec ist optional
+    msgspec = None
+
 DEFAULT_NAMESPACE = "default"
 DEFAULT_OLLAMA_URL = "http://127.0.0.1:11434"
 DEFAULT_MODEL = "nomic-embed-text"
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_MAX_INFLIGHT = 4
+REQUEST_TIMEOUT = 30
+
+
+if msgspec is not None:
+
+    class OllamaEmbedResponse(msgspec.Struct):
+        """Antwort von /api/embed; wird beim Decodieren direkt typgeprüft."""
+
+        embeddings: list[list[float]]
+        model: str | None = None
+
+    _EMBED_DECODER = msgspec.json.Decoder(OllamaEmbedResponse)
+    _DECODE_ERRORS: tuple[type[Exception], ...] = (json.JSONDecodeError, msgspec.MsgspecError)
+else:
+    _EMBED_DECODER = None
+    _DECODE_ERRORS = (json.JSONDecodeError,)
+
+
+def _chunks(items: list[str], size: int) -> Iterator[list[str]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _json_line(item: dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(item) + b"\n"
+    return (json.dumps(item, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
 
 
 class OllamaEmbedder:
     """Kommuniziert mit der Ollama-API zum Erzeugen von Embeddings."""
 
-    def __init__(self, url: str, model: str, allow_empty: bool = False):
+    def __init__(
+        self,
+        url: str,
+        model: str,
+        allow_empty: bool = False,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_inflight: int = DEFAULT_MAX_INFLIGHT,
+    ):
         self.url = url.rstrip("/")
         self.model = model
         self.allow_empty = allow_empty
+        self.batch_size = max(1, batch_size)
+        self.max_inflight = max(1, max_inflight)
+
+        parts = urllib.parse.urlsplit(self.url)
+        self._conn_cls = (
+            http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        )
+        self._netloc = parts.netloc
+        self._base_path = parts.path
+        # Freie Keep-alive-Verbindungen; parallele Batches holen sich je eine
+        self._idle: list[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> OllamaEmbedder:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Schließt alle offenen Keep-alive-Verbindungen."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def _connect(self) -> http.client.HTTPConnection:
+        return self._conn_cls(self._netloc, timeout=REQUEST_TIMEOUT)
+
+    def _acquire(self) -> http.client.HTTPConnection:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._connect()
+
+    def _release(self, conn: http.client.HTTPConnection) -> None:
+        # Pool auf max_inflight freie Verbindungen begrenzen
+        with self._lock:
+            if len(self._idle) < self.max_inflight:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def _post(self, path: str, body: bytes) -> bytes:
+        """POST über eine per Keep-alive wiederverwendete Verbindung."""
+        try:
+            return self._request(path, body, self._acquire())
+        except (ConnectionResetError, BrokenPipeError):
+            # Server hat die Keep-alive-Verbindung geschlossen; die übrigen freien
+            # Verbindungen sind dann meist ebenso tot: Pool leeren und einmal auf
+            # einer frischen Verbindung wiederholen
+            self.close()
+            return self._request(path, body, self._connect())
+
+    def _request(self, path: str, body: bytes, conn: http.client.HTTPConnection) -> bytes:
+        try:
+            conn.request(
+                "POST",
+                f"{self._base_path}{path}",
+                body=body,
+                headers={"Content-Type": "application/json"},
+            )
+            resp = conn.getresponse()
+            data = resp.read()
+        except Exception:
+            conn.close()
+            raise
+        self._release(conn)
+        if resp.status >= 400:
+            raise http.client.HTTPException(f"HTTP {resp.status} {resp.reason}")
+        return data
+
+    def _embed_batch(self, batch: list[str]) -> list[list[float]]:
+        # Ollama /api/embed Endpoint
+        payload = json.dumps({"model": self.model, "input": batch}).encode("utf-8")
+        raw = self._post("/api/embed", payload)
+        if _EMBED_DECODER is not None:
+            embeddings = _EMBED_DECODER.decode(raw).embeddings
+        else:
+            result = json.loads(raw.decode("utf-8"))
+            embeddings = result.get("embeddings")
+            if not isinstance(embeddings, list):
+                raise ValueError(f"Ungültiges Antwortformat von Ollama: {result}")
+        if len(embeddings) != len(batch):
+            raise ValueError(
+                f"Anzahl Embeddings ({len(embeddings)}) entspricht nicht Input ({len(batch)})"
+            )
+        return embeddings
 
     def embed(self, texts: list[str]) -> list[list[float]]:
-        """Erzeugt Embeddings für eine Liste von Texten."""
+        """Erzeugt Embeddings für eine Liste von Texten.
+
+        Die Texte werden in Batches von ``batch_size`` aufgeteilt; bis zu
+        ``max_inflight`` Batches laufen parallel.
+        """
         if not texts:
             return []
 
-        # Ollama /api/embed Endpoint
-        payload = json.dumps({"model": self.model, "input": texts}).encode("utf-8")
-        req = urllib.request.Request(
-            f"{self.url}/api/embed",
-            data=payload,
-            headers={"Content-Type": "application/json"},
-        )
-
+        batches = list(_chunks(texts, self.batch_size))
         try:
-            with urllib.request.urlopen(req, timeout=30) as resp:
-                result = json.loads(resp.read().decode("utf-8"))
-                embeddings = result.get("embeddings")
-                if not isinstance(embeddings, list):
-                    raise ValueError(f"Ungültiges Antwortformat von Ollama: {result}")
-                if len(embeddings) != len(texts):
-                    raise ValueError(
-                        f"Anzahl Embeddings ({len(embeddings)}) "
-                        f"entspricht nicht Input ({len(texts)})"
-                    )
-                return embeddings
+            if self.max_inflight == 1 or len(batches) == 1:
+                results = [self._embed_batch(batch) for batch in batches]
+            else:
+                workers = min(self.max_inflight, len(batches))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    results = list(executor.map(self._embed_batch, batches))
+            return [emb for result in results for emb in result]
         except (
-            urllib.error.HTTPError,
-            urllib.error.URLError,
-            TimeoutError,
-            json.JSONDecodeError,
+            http.client.HTTPException,
+            OSError,
             ValueError,
+            *_DECODE_ERRORS,
         ) as e:
             msg = (
                 f"[semantah] Fehler beim Aufruf von Ollama "
@@ -100,6 +229,18 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Fahre bei Embedding-Fehlern fort und erzeuge leere Vektoren (nicht empfohlen)",
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="Anzahl Texte pro /api/embed-Request",
+    )
+    parser.add_argument(
+        "--max-inflight",
+        type=int,
+        default=DEFAULT_MAX_INFLIGHT,
+        help="Maximale Anzahl paralleler /api/embed-Requests",
+    )
     return parser.parse_args()
 
 
@@ -110,55 +251,89 @@ def ensure_dirs(base: Path) -> Path:
     return gewebe
 
 
+def _read_chunk(chunk_path: Path) -> tuple[Path, str | Exception]:
+    try:
+        return chunk_path, chunk_path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError) as e:
+        return chunk_path, e
+
+
 def write_embeddings(
     gewebe: Path, chunks: list[Path], embedder: OllamaEmbedder
 ) -> dict[str, int]:
-    """Erzeugt Embeddings und schreibt sie als Parquet und JSON-Manifest.
+    """Erzeugt Embeddings und schreibt sie als Parquet und JSONL-Manifest.
     Gibt Statistik über verarbeitete Chunks zurück.
     """
     parquet_path = gewebe / "embeddings.parquet"
-    manifest_path = gewebe / "chunks.json"
+    manifest_path = gewebe / "chunks.jsonl"
 
-    # 1. Texte lesen und Metadaten vorbereiten
+    # 1. Texte lesen und Metadaten spaltenweise vorbereiten
+    namespace = gewebe.parent.name
+    chunk_ids: list[str] = []
+    sources: list[str] = []
     texts: list[str] = []
-    chunk_meta: list[dict[str, Any]] = []
 
-    for chunk_path in chunks:
-        try:
-            content = chunk_path.read_text(encoding="utf-8")
-            texts.append(content)
-            chunk_meta.append(
-                {
-                    "chunk_id": chunk_path.stem,
-                    "source": str(chunk_path),
-                    "namespace": gewebe.parent.name,
-                    "text": content,
-                }
-            )
-        except (OSError, UnicodeDecodeError) as e:
-            print(f"[semantah] Fehler beim Lesen von {chunk_path}: {e}")
+    # Dateien parallel lesen; map() liefert in Eingabereihenfolge
+    workers = min(32, (os.cpu_count() or 4) * 4)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(_read_chunk, chunks))
+
+    for chunk_path, content in results:
+        if isinstance(content, Exception):
+            print(f"[semantah] Fehler beim Lesen von {chunk_path}: {content}")
+            continue
+        chunk_ids.append(chunk_path.stem)
+        sources.append(str(chunk_path))
+        texts.append(content)
 
     # 2. Embeddings erzeugen
     embeddings = embedder.embed(texts)
 
-    # 3. Daten zusammenführen
-    if len(chunk_meta) != len(embeddings):
+    # 3. Konsistenz prüfen
+    if len(texts) != len(embeddings):
         raise RuntimeError(
-            f"Datenintegritätsfehler: Chunks ({len(chunk_meta)}) != Embeddings ({len(embeddings)})"
+            f"Datenintegritätsfehler: Chunks ({len(texts)}) != Embeddings ({len(embeddings)})"
         )
 
-    manifest_data: list[dict[str, Any]] = []
-    for meta, emb in zip(chunk_meta, embeddings, strict=True):
-        manifest_data.append({**meta, "embedding": emb})
-
-    # 4. Parquet schreiben (erfordert pyarrow)
+    # 4. Parquet schreiben (erfordert pyarrow), aus Spalten mit festem Schema
     try:
         import pyarrow as pa
         import pyarrow.parquet as pq
 
-        table = pa.Table.from_pylist(manifest_data)
-        pq.write_table(table, parquet_path)
-        print(f"[semantah] {len(manifest_data)} Embeddings in {parquet_path} geschrieben")
+        # float32 mit fester Dimension, sofern alle Vektoren gleich lang und nicht leer sind
+        # (fixed_size_list[0] lässt sich nicht zurücklesen, z. B. bei --allow-empty-embeddings)
+        dims = {len(emb) for emb in embeddings}
+        if len(dims) == 1 and (dim := dims.pop()) > 0:
+            emb_type = pa.list_(pa.float32(), dim)
+        else:
+            emb_type = pa.list_(pa.float32())
+        schema = pa.schema(
+            [
+                ("chunk_id", pa.string()),
+                ("source", pa.string()),
+                ("namespace", pa.string()),
+                ("text", pa.large_string()),
+                ("embedding", emb_type),
+            ]
+        )
+        table = pa.Table.from_arrays(
+            [
+                pa.array(chunk_ids, pa.string()),
+                pa.array(sources, pa.string()),
+                pa.repeat(pa.scalar(namespace, pa.string()), len(texts)),
+                pa.array(texts, pa.large_string()),
+                pa.array(embeddings, type=emb_type),
+            ],
+            schema=schema,
+        )
+        pq.write_table(
+            table,
+            parquet_path,
+            compression="zstd",
+            use_dictionary=["namespace"],
+            write_statistics=False,
+        )
+        print(f"[semantah] {len(embeddings)} Embeddings in {parquet_path} geschrieben")
         # Aufräumen falls Hinweis-Datei existierte
         hint_file = gewebe / "embeddings.parquet.MISSING_PYARROW.txt"
         if hint_file.exists():
@@ -173,15 +348,29 @@ def write_embeddings(
             with contextlib.suppress(Exception):
                 parquet_path.unlink()
 
-    # 5. JSON-Manifest schreiben
-    manifest_path.write_text(
-        json.dumps(manifest_data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
-    )
+    # 5. JSONL-Manifest zeilenweise schreiben (ohne zusammengeführte Kopie im Speicher)
+    with manifest_path.open("wb") as handle:
+        for chunk_id, source, text, emb in zip(chunk_ids, sources, texts, embeddings, strict=True):
+            handle.write(
+                _json_line(
+                    {
+                        "chunk_id": chunk_id,
+                        "source": source,
+                        "namespace": namespace,
+                        "text": text,
+                        "embedding": emb,
+                    }
+                )
+            )
+    # Altes JSON-Manifest früherer Läufe entfernen
+    legacy_manifest = gewebe / "chunks.json"
+    if legacy_manifest.exists():
+        legacy_manifest.unlink()
 
     return {
         "passed": len(chunks),
-        "read": len(chunk_meta),
-        "embedded": len(manifest_data),
+        "read": len(texts),
+        "embedded": len(embeddings),
     }
 
 
@@ -203,7 +392,7 @@ def write_report(gewebe: Path, stats: dict[str, int]) -> None:
     else:
         lines.append("Parquet-Artefakt: (Übersprungen oder Fehler)")
 
-    lines.append(f"Manifest: {gewebe / 'chunks.json'}")
+    lines.append(f"Manifest: {gewebe / 'chunks.jsonl'}")
     report_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
 
 
@@ -212,9 +401,15 @@ def main() -> None:
     namespace_dir = Path(args.index_path).expanduser() / args.namespace
     gewebe = ensure_dirs(namespace_dir)
 
-    embedder = OllamaEmbedder(args.ollama_url, args.model, allow_empty=args.allow_empty_embeddings)
     chunk_paths = [Path(chunk) for chunk in args.chunks] if args.chunks else []
-    stats = write_embeddings(gewebe, chunk_paths, embedder)
+    with OllamaEmbedder(
+        args.ollama_url,
+        args.model,
+        allow_empty=args.allow_empty_embeddings,
+        batch_size=args.batch_size,
+        max_inflight=args.max_inflight,
+    ) as embedder:
+        stats = write_embeddings(gewebe, chunk_paths, embedder)
     write_report(gewebe, stats)
 
     print(f"[semantah] embeddings aktualisiert unter {gewebe}")